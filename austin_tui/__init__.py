@@ -23,7 +23,6 @@
 import os
 import sys
 from enum import Enum
-from traceback import format_exception
 
 
 class AustinProfileMode(Enum):
@@ -34,15 +33,13 @@ class AustinProfileMode(Enum):
 
 
 if os.environ.get("AUSTIN_TUI_DEBUG"):
+    from traceback import TracebackException
+
     _original_excepthook = sys.excepthook
 
     def _excepthook(exc_type, exc, tb):
-        try:
-            os.remove("austin-tui.exc")
-        except Exception:
-            pass
         with open("austin-tui.exc", "w") as fout:
-            fout.writelines(format_exception(exc_type, exc, tb))
+            fout.writelines(TracebackException(exc_type, exc, tb).format())
         _original_excepthook(exc_type, exc, tb)
 
     sys.excepthook = _excepthook
@@ -22,8 +22,10 @@
 
 import asyncio
 import sys
-from textwrap import wrap
+from textwrap import fill
 from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import List
 from typing import Optional
 
@@ -39,8 +41,7 @@ from austin_tui.view.austin import AustinView
 
 
 def _print(text: str) -> None:
-    for line in wrap(text, 78):
-        print(line)
+    sys.stdout.write(fill(text, 78) + "\n")
 
 
 class AustinTUIArgumentParser(AustinArgumentParser):
@@ -68,21 +69,42 @@ class AustinTUI(AsyncAustin):
     def __init__(self) -> None:
         super().__init__()
 
+        if sys.platform == "win32":
+            self._loop = asyncio.ProactorEventLoop()
+            asyncio.set_event_loop(self._loop)
+        else:
+            try:
+                import uvloop
+
+                self._loop = uvloop.new_event_loop()
+                asyncio.set_event_loop(self._loop)
+            except ImportError:
+                self._loop = asyncio.get_event_loop()
+
         self._args = AustinTUIArgumentParser().parse_args()
 
         self._controller = AustinTUIController()
         self._view = self._controller.view
 
+        # Bound once as these are called for every sample
+        self._update = self._controller.model.austin.update
+        self._data_ready = self._controller.data_ready.set
+
         mode = AustinProfileMode.MEMORY if self._args.memory else AustinProfileMode.TIME
         self._view.mode = mode
 
+        self._event_dispatch: Dict[AustinView.Event, Callable[[Any], None]] = {
+            AustinView.Event.QUIT: self.on_shutdown,
+            AustinView.Event.EXCEPTION: self.on_exception,
+        }
         self._view.callback = self.on_view_event
 
         self._global_stats: Optional[str] = None
 
     def on_sample_received(self, sample: str) -> None:
         """Austin sample received callback."""
-        self._controller.model.austin.update(sample)
+        if self._update(sample):
+            self._data_ready()
 
     def on_ready(
         self, austin_process: Process, child_process: Process, command_line: str
@@ -108,16 +130,12 @@ class AustinTUI(AsyncAustin):
 
     def on_view_event(self, event: AustinView.Event, data: Any = None) -> None:
         """View events handler."""
+        try:
+            handler = self._event_dispatch[event]
+        except KeyError:
+            raise RuntimeError(f"Unhandled view event: {event}") from None
 
-        def _unhandled(_: Any) -> None:
-            raise RuntimeError(f"Unhandled view event: {event}")
-
-        {
-            AustinView.Event.QUIT: self.on_shutdown,
-            AustinView.Event.EXCEPTION: self.on_exception,
-        }.get(event, _unhandled)(
-            data
-        )  # type: ignore[operator]
+        handler(data)
 
     async def start(self, args: List[str]) -> None:
         """Start Austin and catch any exceptions."""
@@ -130,13 +148,12 @@ class AustinTUI(AsyncAustin):
 
     def run(self) -> None:
         """Run the TUI."""
-        loop = asyncio.get_event_loop()
-
-        austin = loop.create_task(
+        austin = self._loop.create_task(
             self.start(AustinTUIArgumentParser.to_list(self._args))
         )
-        loop.run_forever()
+        self._loop.run_forever()
 
+        self._controller.close()
         self._view.close()
 
         if not austin.done():
@@ -152,7 +169,7 @@ class AustinTUI(AsyncAustin):
         except AustinError:
             pass
 
-        asyncio.get_event_loop().stop()
+        self._loop.stop()
 
     def on_shutdown(self, _: Any = None) -> None:
         """The shutdown view event handler."""
@@ -166,9 +183,6 @@ class AustinTUI(AsyncAustin):
 
 def main() -> None:
     """Main function."""
-    if sys.platform == "win32":
-        asyncio.set_event_loop(asyncio.ProactorEventLoop())
-
     tui = AustinTUI()
 
     try:
@@ -20,15 +20,25 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from collections import deque
+from functools import lru_cache
+from itertools import islice
 from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
+from austin.stats import Frame
+from austin.stats import FrameStats
 from austin.stats import ThreadStats
 
 from austin_tui import AustinProfileMode
 from austin_tui.model import Model
 from austin_tui.model.austin import AustinModel
+from austin_tui.model.austin import ThreadKey
 from austin_tui.model.system import Bytes
 from austin_tui.model.system import FrozenSystemModel
 from austin_tui.model.system import Percentage
@@ -36,10 +46,36 @@ from austin_tui.model.system import SystemModel
 from austin_tui.view import View
 from austin_tui.widgets.graph import FlameGraphData
 from austin_tui.widgets.markup import AttrString
+from austin_tui.widgets.markup import AttrStringChunk
 from austin_tui.widgets.markup import escape
 from austin_tui.widgets.table import TableData
 
 
+@lru_cache(maxsize=4096)
+def _flamegraph_key(label: Frame) -> str:
+    return f"{label.function} ({label.filename})"
+
+
+@lru_cache(maxsize=1024)
+def _tree_prefixes(prefix: str) -> Tuple[str, str, str, str]:
+    # The markers and prefixes for the last child and for any other child
+    return prefix + "└─ ", prefix + "   ", prefix + "├─ ", prefix + "│  "
+
+
+def _count_frames(subtrees: Iterable[FrameStats], threshold: float) -> int:
+    # Count the frames in the given subtrees that are above the threshold. The
+    # roots of the subtrees are assumed to be above the threshold already.
+    count = 0
+    pending = list(subtrees)
+    while pending:
+        stats = pending.pop()
+        count += 1
+        pending.extend(
+            child for child in stats.children.values() if child.total.value >= threshold
+        )
+    return count
+
+
 class Adapter:
     """Model-View adapter.
 
@@ -58,10 +94,42 @@ class Adapter:
         self._model = model
         self._view = view
 
+        # The live models are never replaced, so we can bind them once
+        self._austin = model.austin
+        self._system = model.system
+
+        self._thread: Optional[Tuple[AustinModel, int, ThreadKey, ThreadStats]] = None
+        self._last: Optional[Any] = None
+
     def __call__(self) -> bool:
         """Invoke the adapter."""
         return self.update(self.transform())
 
+    def _changed(self, data: Any) -> bool:
+        # Record the given data and tell whether it differs from the last seen
+        if data == self._last:
+            return False
+
+        self._last = data
+        return True
+
+    def _update_if_changed(self, data: Any) -> bool:
+        return self._changed(data) and self.update(data)
+
+    def _current_thread(self, austin: AustinModel) -> Tuple[ThreadKey, ThreadStats]:
+        # Thread statistics objects are updated in place, so the resolved
+        # thread stays valid until another thread, or model, is selected.
+        index = austin.current_thread
+        cached = self._thread
+        if cached is not None and cached[0] is austin and cached[1] == index:
+            return cached[2], cached[3]
+
+        thread_key = austin.threads[index]
+        thread_stats = austin.stats.processes[thread_key.pid].threads[thread_key.thread]
+        self._thread = (austin, index, thread_key, thread_stats)
+
+        return thread_key, thread_stats
+
     def transform(self) -> Any:
         """Transform the model data into the widget data."""
         pass
@@ -80,10 +148,13 @@ class FreezableAdapter(Adapter):
         self._data: Optional[Any] = None
 
     def __call__(self) -> bool:
-        """Invoke the adapter on either live or frozen data."""
-        if self._frozen:
-            return self.update(self.defrost())
-        return super().__call__()
+        """Invoke the adapter on either live or frozen data.
+
+        The widget is only updated if the data has changed since the last call.
+        """
+        return self._update_if_changed(
+            self.defrost() if self._frozen else self.transform()
+        )
 
     def freeze(self) -> None:
         """Freeze the widget data."""
@@ -112,8 +183,7 @@ class CommandLineAdapter(FreezableAdapter):
 
     def transform(self) -> AttrString:
         """Retrieve the command line."""
-        cmd = self._model.austin.command_line
-        exec, _, args = cmd.partition(" ")
+        exec, _, args = self._austin.command_line.partition(" ")
         return self._view.markup(f"<exec><b>{escape(exec)}</b></exec> {escape(args)}")
 
     def update(self, data: AttrString) -> bool:
@@ -126,7 +196,7 @@ class CountAdapter(FreezableAdapter):
 
     def transform(self) -> int:
         """Retrieve the count."""
-        return self._model.austin.samples_count
+        return self._austin.samples_count
 
     def update(self, data: int) -> bool:
         """Update the widget."""
@@ -138,11 +208,12 @@ class CpuAdapter(Adapter):
 
     def transform(self) -> Percentage:
         """Get the CPU usage."""
-        return self._model.system.get_cpu(self._model.system.child_process)
+        return self._system.cpu
 
     def update(self, data: Percentage) -> bool:
         """Update the metric and the plot."""
-        self._view.cpu.set_text(f"{data}% ")
+        if self._changed(data):
+            self._view.cpu.set_text(f"{data}% ")
         self._view.cpu_plot.push(data)
         return True
 
@@ -152,23 +223,29 @@ class MemoryAdapter(Adapter):
 
     def transform(self) -> Bytes:
         """Get memory usage."""
-        return self._model.system.get_memory(self._model.system.child_process)
+        return self._system.memory
 
     def update(self, data: Bytes) -> bool:
         """Update metric and plot."""
-        self._view.mem.set_text(f"{data>>20}M ")
+        mb = data >> 20
+        if self._changed(mb):
+            self._view.mem.set_text(f"{mb}M ")
         self._view.mem_plot.push(data)
         return True
 
 
+@lru_cache(maxsize=128)
+def _fmt_seconds(s: int) -> str:
+    if s < 60:
+        return f'{s:02d}"'
+
+    m, s = divmod(s, 60)
+    return f"{m}'{s:02d}\""
+
+
 def fmt_time(s: int) -> str:
     """Format microseconds into mm':ss''."""
-    m = int(s // 60e6)
-    ret = '{:02d}"'.format(round(s / 1e6) % 60)
-    if m:
-        ret = str(m) + "'" + ret
-
-    return ret
+    return _fmt_seconds((s + 500_000) // 1_000_000)
 
 
 class DurationAdapter(FreezableAdapter):
@@ -176,7 +253,7 @@ class DurationAdapter(FreezableAdapter):
 
     def transform(self) -> str:
         """Get duration."""
-        return fmt_time(int(self._model.system.duration * 1e6))
+        return _fmt_seconds(int(self._system.duration + 0.5))
 
     def update(self, data: str) -> bool:
         """Update the widget."""
@@ -186,9 +263,13 @@ class DurationAdapter(FreezableAdapter):
 class CurrentThreadAdapter(Adapter):
     """Currently selected thread adapter."""
 
+    def __call__(self) -> bool:
+        """Update the widget only if the current thread has changed."""
+        return self._update_if_changed(self.transform())
+
     def transform(self) -> Union[str, AttrString]:
         """Get current thread."""
-        austin = self._model.frozen_austin if self._model.frozen else self._model.austin
+        austin = self._model.frozen_austin if self._model.frozen else self._austin
         n = len(austin.threads)
         if not n:
             return "--/--"
@@ -207,9 +288,9 @@ class ThreadNameAdapter(FreezableAdapter):
 
     def transform(self) -> Union[str, AttrString]:
         """Get the thread name."""
-        austin = self._model.frozen_austin if self._model.frozen else self._model.austin
+        austin = self._model.frozen_austin if self._model.frozen else self._austin
         if austin.threads:
-            pid, _, tid = austin.threads[austin.current_thread].partition(":")
+            pid, tid = austin.threads[austin.current_thread]
             return self._view.markup(f"<pid><b>{pid}</b></pid>:<tid><b>{tid}</b></tid>")
         return "--:--"
 
@@ -221,15 +302,76 @@ class ThreadNameAdapter(FreezableAdapter):
 class BaseThreadDataAdapter(Adapter):
     """Base implementation for the thread table data adapter."""
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._table = self._view.table
+        self._mode: Optional[AustinProfileMode] = None
+
+        # Rows are built straight out of attribute string chunks, rather than
+        # by parsing markup, so we resolve the colors we need only once.
+        palette = self._view.palette
+        self._colors = tuple(
+            palette.get_color(_) for _ in ("default", "inactive", "filename", "lineno")
+        )
+        self._mode_helpers: Tuple[Callable, Callable, bool]
+
+        self._signature: Optional[tuple] = None
+        self._data: Optional[TableData] = None
+
+    def __call__(self) -> bool:
+        """Invoke the adapter.
+
+        The table data is only rebuilt if the statistics, the current thread,
+        the threshold or the view mode have changed since the last call, or if
+        the table is showing data from another adapter. The live duration and
+        memory peak change on every call, so they are only part of the check
+        for frozen data. Live rows are rescaled when new samples arrive.
+        """
+        frozen = self._model.frozen
+        austin = self._model.frozen_austin if frozen else self._austin
+        system = self._model.frozen_system if frozen else self._system
+        signature: tuple = (
+            austin,
+            austin.current_thread,
+            austin.stats.timestamp,
+            self._austin.threshold,
+            self._view.mode,
+        )
+        if frozen:
+            signature += (system.duration, system.max_memory)
+        if signature == self._signature and self._table.data is self._data:
+            return False
+
+        self._signature = signature
+        updated = self.update(self._transform(austin, system))
+        # The table keeps its current data when the new data compares equal,
+        # so we track what it actually holds.
+        self._data = self._table.data
+        return updated
+
+    def _resolve_mode(self) -> Tuple[Callable, Callable, bool]:
+        # The view mode is only set after the adapters have been created, so
+        # the mode helpers are resolved lazily and cached until it changes.
+        mode = self._view.mode
+        if mode is not self._mode:
+            self._mode = mode
+            view = self._view
+            self._mode_helpers = (
+                (view.fmt_mem, view.scale_memory, True)
+                if mode == AustinProfileMode.MEMORY
+                else (view.fmt_time, view.scale_time, False)
+            )
+        return self._mode_helpers
+
     def transform(self) -> TableData:
         """Transform according to the right model."""
-        austin = self._model.frozen_austin if self._model.frozen else self._model.austin
-        system = self._model.frozen_system if self._model.frozen else self._model.system
+        austin = self._model.frozen_austin if self._model.frozen else self._austin
+        system = self._model.frozen_system if self._model.frozen else self._system
         return self._transform(austin, system)
 
     def update(self, data: TableData) -> bool:
         """Update the table."""
-        return self._view.table.set_data(data)
+        return self._table.set_data(data)
 
 
 class ThreadDataAdapter(BaseThreadDataAdapter):
@@ -238,44 +380,39 @@ class ThreadDataAdapter(BaseThreadDataAdapter):
     def _transform(
         self, austin: AustinModel, system: Union[SystemModel, FrozenSystemModel]
     ) -> TableData:
-        formatter, scaler = (
-            (self._view.fmt_mem, self._view.scale_memory)
-            if self._view.mode == AustinProfileMode.MEMORY
-            else (self._view.fmt_time, self._view.scale_time)
-        )
-        thread_key = austin.threads[austin.current_thread]
-        pid, _, thread = thread_key.partition(":")
-
-        thread_stats = austin.stats.processes[int(pid)].threads[thread]
+        formatter, scaler, memory = self._resolve_mode()
+        thread_key, thread_stats = self._current_thread(austin)
         frames = austin.get_last_stack(thread_key).frames
 
+        max_scale = system.max_memory if memory else system.duration
+        threshold = self._austin.threshold * max_scale * 1e6
+        default, inactive, _, _ = self._colors
+
         container = thread_stats.children
-        frame_stats = []
-        max_scale = (
-            system.max_memory
-            if self._view.mode == AustinProfileMode.MEMORY
-            else system.duration
-        )
+        frame_stats: TableData = []
+        append = frame_stats.append
         for frame in frames:
             child_frame_stats = container[frame]
-            if (
-                child_frame_stats.total.value / 1e6 / max_scale
-                < self._model.austin.threshold
-            ):
+            own = child_frame_stats.own.value
+            total = child_frame_stats.total.value
+            if total < threshold:
                 break
-            frame_stats.append(
-                [
-                    formatter(child_frame_stats.own.value),
-                    formatter(child_frame_stats.total.value),
-                    scaler(child_frame_stats.own.value, max_scale),
-                    scaler(child_frame_stats.total.value, max_scale),
-                    self._view.markup(
-                        " "
-                        + escape(child_frame_stats.label.function)
-                        + f" <inactive>({escape(child_frame_stats.label.filename)}"
-                        f":{child_frame_stats.label.line})</inactive>"
+            label = child_frame_stats.label
+            append(
+                (
+                    formatter(own),
+                    formatter(total),
+                    scaler(own, max_scale),
+                    scaler(total, max_scale),
+                    AttrString(
+                        [
+                            AttrStringChunk(f" {label.function} ", default),
+                            AttrStringChunk(
+                                f"({label.filename}:{label.line})", inactive
+                            ),
+                        ]
                     ),
-                ]
+                )
             )
             container = child_frame_stats.children
 
@@ -285,41 +422,64 @@ class ThreadDataAdapter(BaseThreadDataAdapter):
 class ThreadFullDataAdapter(BaseThreadDataAdapter):
     """Full thread data adapter."""
 
+    # Cap on the number of rows in the full tree. Any frames beyond it are
+    # replaced by a single elision row, which reports how many of them are
+    # above the threshold.
+    max_rows = 2000
+
     def _transform(
         self, austin: AustinModel, system: Union[SystemModel, FrozenSystemModel]
     ) -> TableData:
-        formatter, scaler = (
-            (self._view.fmt_mem, self._view.scale_memory)
-            if self._view.mode == AustinProfileMode.MEMORY
-            else (self._view.fmt_time, self._view.scale_time)
-        )
-
-        thread_key = austin.threads[austin.current_thread]
-        pid, _, thread = thread_key.partition(":")
+        formatter, scaler, memory = self._resolve_mode()
 
+        thread_key, thread_stats = self._current_thread(austin)
         frames = austin.get_last_stack(thread_key).frames
-        frame_stats = []
-        max_scale = (
-            system.max_memory
-            if self._view.mode == AustinProfileMode.MEMORY
-            else system.duration
-        )
+        frame_stats: TableData = []
+        max_scale = system.max_memory if memory else system.duration
+        threshold = self._austin.threshold * max_scale * 1e6
+        default, inactive, filename_color, lineno_color = self._colors
+        append = frame_stats.append
+        max_rows = self.max_rows
+
+        # Walk the call tree depth-first with an explicit stack. Children are
+        # pushed in reverse order so that they are popped in their natural one.
+        stack: List[Tuple[FrameStats, str, str, int, Optional[dict], bool]] = []
+        push = stack.append
+        pop = stack.pop
+
+        # Frames below the threshold are pruned before they are pushed. The
+        # total of a frame never exceeds that of its parent, so their whole
+        # subtree is skipped too.
+        children = tuple(thread_stats.children.values())
+        if children:
+            last_marker, last_prefix, marker, prefix = _tree_prefixes("")
+            last = children[-1]
+            if last.total.value >= threshold:
+                push((last, last_marker, last_prefix, 0, thread_stats.children, True))
+            for child in islice(reversed(children), 1, None):
+                if child.total.value >= threshold:
+                    push((child, marker, prefix, 0, thread_stats.children, True))
+
+        while stack:
+            if len(frame_stats) >= max_rows:
+                n = _count_frames((entry[0] for entry in stack), threshold)
+                blank = AttrStringChunk(" " * 8, default)
+                elided = AttrStringChunk(
+                    f" … {n} more frame{'s' if n > 1 else ''} elided", inactive
+                )
+                append((blank, blank, blank, blank, AttrString([elided])))
+                break
+
+            stats, marker, prefix, level, active_bucket, active_parent = pop()
 
-        def _add_frame_stats(
-            stats: ThreadStats,
-            marker: str,
-            prefix: str,
-            level: int = 0,
-            active_bucket: Optional[dict] = None,
-            active_parent: bool = True,
-        ) -> None:
-            if stats.total.value / 1e6 / max_scale < self._model.austin.threshold:
-                return
+            own = stats.own.value
+            total = stats.total.value
+            label = stats.label
             try:
                 active = (
                     active_bucket is not None
-                    and stats.label in active_bucket
-                    and stats.label == frames[level]
+                    and label in active_bucket
+                    and label == frames[level]
                     and active_parent
                 )
                 active_bucket = stats.children
@@ -327,55 +487,41 @@ class ThreadFullDataAdapter(BaseThreadDataAdapter):
                 active = False
                 active_bucket = None
 
-            frame_stats.append(
-                [
-                    formatter(stats.own.value, active),
-                    formatter(stats.total.value, active),
-                    scaler(stats.own.value, max_scale, active),
-                    scaler(stats.total.value, max_scale, active),
-                    self._view.markup(
-                        " "
-                        + f"<inactive>{marker}</inactive>"
-                        + (
-                            escape(stats.label.function)
-                            if active
-                            else f"<inactive>{escape(stats.label.function)}</inactive>"
-                        )
-                        + f" <inactive>(<filename>{escape(stats.label.filename)}</filename>"
-                        f":<lineno>{stats.label.line}</lineno>)</inactive>"
+            append(
+                (
+                    formatter(own, active),
+                    formatter(total, active),
+                    scaler(own, max_scale, active),
+                    scaler(total, max_scale, active),
+                    AttrString(
+                        [
+                            AttrStringChunk(" ", default),
+                            AttrStringChunk(marker, inactive),
+                            AttrStringChunk(
+                                label.function, default if active else inactive
+                            ),
+                            AttrStringChunk(" ", default),
+                            AttrStringChunk("(", inactive),
+                            AttrStringChunk(label.filename, filename_color),
+                            AttrStringChunk(":", inactive),
+                            AttrStringChunk(str(label.line), lineno_color),
+                            AttrStringChunk(")", inactive),
+                        ]
                     ),
-                ]
-            )
-            children_stats = [child_stats for _, child_stats in stats.children.items()]
-            if not children_stats:
-                return
-            for child_stats in children_stats[:-1]:
-                _add_frame_stats(
-                    child_stats,
-                    prefix + "├─ ",
-                    prefix + "│  ",
-                    level + 1,
-                    active_bucket,
-                    active,
                 )
-
-            _add_frame_stats(
-                children_stats[-1],
-                prefix + "└─ ",
-                prefix + "   ",
-                level + 1,
-                active_bucket,
-                active,
             )
 
-        thread_stats = austin.stats.processes[int(pid)].threads[thread]
-
-        children = [stats for _, stats in thread_stats.children.items()]
-        if children:
-            for stats in children[:-1]:
-                _add_frame_stats(stats, "├─ ", "│  ", 0, thread_stats.children)
-
-            _add_frame_stats(children[-1], "└─ ", "   ", 0, thread_stats.children)
+            children = tuple(stats.children.values())
+            if not children:
+                continue
+            level += 1
+            last_marker, last_prefix, marker, prefix = _tree_prefixes(prefix)
+            last = children[-1]
+            if last.total.value >= threshold:
+                push((last, last_marker, last_prefix, level, active_bucket, active))
+            for child in islice(reversed(children), 1, None):
+                if child.total.value >= threshold:
+                    push((child, marker, prefix, level, active_bucket, active))
 
         return frame_stats
 
@@ -383,19 +529,21 @@ class ThreadFullDataAdapter(BaseThreadDataAdapter):
 class FlameGraphAdapter(Adapter):
     """Flame graph data adapter."""
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._flamegraph = self._view.flamegraph
+        self._graph_header = self._view.graph_header
+
     def transform(self) -> dict:
         """Transform according to the right model."""
-        austin = self._model.frozen_austin if self._model.frozen else self._model.austin
-        system = self._model.frozen_system if self._model.frozen else self._model.system
+        austin = self._model.frozen_austin if self._model.frozen else self._austin
+        system = self._model.frozen_system if self._model.frozen else self._system
         return self._transform(austin, system)  # type: ignore[arg-type]
 
     def _transform(
         self, austin: AustinModel, system: Union[SystemModel, FrozenSystemModel]
     ) -> dict:
-        thread_key = austin.threads[austin.current_thread]
-        pid, _, thread = thread_key.partition(":")
-
-        thread = austin.stats.processes[int(pid)].threads[thread]
+        _, thread = self._current_thread(austin)
 
         cs = {}  # type: ignore[var-annotated]
         total = thread.total.value
@@ -403,23 +551,25 @@ class FlameGraphAdapter(Adapter):
         data: FlameGraphData = {
             f"THREAD {thread.label} ⏲️  {fmt_time(total)} ({total_pct}%)": (total, cs)
         }
-        levels = [(c, cs) for c in thread.children.values()]
+        levels = deque((c, cs) for c in thread.children.values())
+        popleft, extend = levels.popleft, levels.extend
         while levels:
-            level, c = levels.pop(0)
-            k = f"{level.label.function} ({level.label.filename})"
-            if k in c:
-                v, cs = c[k]
-                c[k] = (v + level.total.value, cs)
-            else:
+            level, c = popleft()
+            k = _flamegraph_key(level.label)
+            entry = c.get(k)
+            if entry is None:
                 cs = {}
                 c[k] = (level.total.value, cs)
-            levels.extend(((c, cs) for c in level.children.values()))
+            else:
+                v, cs = entry
+                c[k] = (v + level.total.value, cs)
+            extend((c, cs) for c in level.children.values())
 
         return data
 
     def update(self, data: FlameGraphData) -> bool:
         """Update the table."""
         (header,) = data
-        return self._view.flamegraph.set_data(data) | self._view.graph_header.set_text(
+        return self._flamegraph.set_data(data) | self._graph_header.set_text(
             " FLAME GRAPH FOR " + header
         )
@@ -22,9 +22,13 @@
 
 import asyncio
 from enum import Enum
-from io import StringIO
+from time import monotonic
 from time import time
 from typing import Any
+from typing import Optional
+from typing import TextIO
+from typing import Tuple
+from typing import Type
 
 from austin_tui import AustinProfileMode
 from austin_tui.adapters import Adapter
@@ -50,6 +54,38 @@ class ThreadNav(Enum):
     NEXT = 1
 
 
+class _SampleWriter:
+    """Text stream wrapper that drops the metadata lines from a stats dump."""
+
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+        self._tail = ""
+
+    def write(self, text: str) -> None:
+        """Write the complete sample lines in the given text."""
+        *lines, self._tail = (self._tail + text).split("\n")
+        self._stream.writelines(
+            line + "\n" for line in lines if not line.startswith("# ")
+        )
+
+    def close(self) -> None:
+        """Write any pending partial line."""
+        if self._tail and not self._tail.startswith("# "):
+            self._stream.write(self._tail + "\n")
+        self._tail = ""
+
+
+def _collect_adapters(cls: type) -> Tuple[Tuple[str, Type[Adapter]], ...]:
+    adapters = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in klass.__dict__.items():
+            if isinstance(value, type) and issubclass(value, Adapter):
+                adapters[name] = value
+            else:
+                adapters.pop(name, None)
+    return tuple(adapters.items())
+
+
 class AustinTUIController:
     """Austin controller.
 
@@ -69,12 +105,25 @@ class AustinTUIController:
     command_line = CommandLineAdapter
     flamegraph = FlameGraphAdapter
 
+    _adapters: Tuple[Tuple[str, Type[Adapter]], ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Collect the adapters of the subclass, including the inherited ones."""
+        super().__init_subclass__(**kwargs)
+        cls._adapters = _collect_adapters(cls)
+
     def __init__(self) -> None:
         self._full_mode = False
         self._graph = False
         self._scaler = None
         self._formatter = None
-        self._last_timestamp = 0
+        self._last_timestamp = -1
+        self._data_redraw: Optional[asyncio.TimerHandle] = None
+
+        # Set by the sample producer whenever a new sample is merged
+        self.data_ready = asyncio.Event()
+        # Set when the view is resumed, to wake the paused update loop
+        self._resumed = asyncio.Event()
 
         view_builder = ViewBuilder.from_resource("austin_tui.view", "tui.austinui")
 
@@ -85,11 +134,7 @@ class AustinTUIController:
         self.model.austin.mode = view.mode
 
         # Auto-create adapters
-        for name, adapter_class in (
-            (n, v)
-            for n, v in type(self).__dict__.items()
-            if isinstance(v, type) and v.__mro__[-2] == Adapter
-        ):
+        for name, adapter_class in self._adapters:
             setattr(self, name, adapter_class(self.model, self.view))
 
     def set_thread_data(self) -> None:
@@ -97,6 +142,12 @@ class AustinTUIController:
         if not self.model.austin.threads:
             return
 
+        # There is no point in building rows that cannot be seen, e.g. when
+        # the terminal is too small. The timestamp is left as it is so that
+        # the data is rebuilt on the next update once there is room for it.
+        if (self.view.flame_view if self._graph else self.view.stats_view).size.y <= 0:
+            return
+
         if self._graph:
             self.flamegraph()  # type: ignore[call-arg]
         else:
@@ -123,17 +174,16 @@ class AustinTUIController:
     def _add_flamegraph_palette(self) -> None:
         colors = [196, 202, 214, 124, 160, 166, 208]
         palette = self.view.palette
+        add, get = palette.add_color, palette.get_color
 
+        fg_ids, fgf_ids = [], []
         for i, color in enumerate(colors):
-            palette.add_color(f"fg{i}", 15, color)
-            palette.add_color(f"fgf{i}", color)
-
-        self.view.flamegraph.set_palette(
-            (
-                [palette.get_color(f"fg{i}") for i in range(len(colors))],
-                [palette.get_color(f"fgf{i}") for i in range(len(colors))],
-            )
-        )
+            add(f"fg{i}", 15, color)
+            add(f"fgf{i}", color)
+            fg_ids.append(get(f"fg{i}"))
+            fgf_ids.append(get(f"fgf{i}"))
+
+        self.view.flamegraph.set_palette((fg_ids, fgf_ids))
 
     def start(self) -> None:
         """Start event."""
@@ -153,37 +203,129 @@ class AustinTUIController:
     def stop(self) -> None:
         """Stop event."""
         self.model.system.stop()
+        self._cancel_redraws()
+
+    def close(self) -> None:
+        """Close event."""
+        self._cancel_redraws()
+
+    def _schedule_data_redraw(self) -> None:
+        # Coalesce the redraws caused by repeated key presses
+        if self._data_redraw is not None:
+            self._data_redraw.cancel()
+        self._data_redraw = self.view._loop.call_later(  # type: ignore[union-attr]
+            0.05, self._redraw_data
+        )
+
+    def _redraw_data(self) -> None:
+        self._data_redraw = None
+        try:
+            self.set_thread_data()
+            if self._graph:
+                self.view.flamegraph.draw()
+                self.view.flame_view.refresh()
+            else:
+                self.view.table.draw()
+                self.view.stats_view.refresh()
+        except Exception as exc:
+            self.view.on_exception(exc)
+
+    def _cancel_redraws(self) -> None:
+        if self._data_redraw is not None:
+            self._data_redraw.cancel()
+            self._data_redraw = None
 
     def update(self) -> bool:
         """Update event."""
         if self.model.frozen:
             return False
 
-        # System data
+        self._update_system()
+
+        return self._update_thread_data()
+
+    def _update_system(self) -> None:
+        # System data. The plots stop once the child process is gone.
         self.duration()
-        self.cpu()  # type: ignore[call-arg]
-        self.memory()  # type: ignore[call-arg]
+        system = self.model.system
+        if system.sample(system.child_process) is not None:
+            self.cpu()  # type: ignore[call-arg]
+            self.memory()  # type: ignore[call-arg]
 
         # Samples count
         self.samples()
 
+    def _update_thread_data(self) -> bool:
         if self.model.austin.stats.timestamp > self._last_timestamp:
             return self.set_thread()
 
         return False
 
     async def update_loop(self) -> None:
-        """The UI update loop."""
+        """The UI update loop.
+
+        The system metrics are sampled on a fixed tick of one second, so that
+        the plots keep their time scale. The thread data is redrawn at most
+        once a second. If it has not been redrawn for at least a second, the
+        arrival of new samples wakes the loop up straight away, so that the
+        thread data is not shown late.
+
+        While the view is paused there is nothing to update, so the loop backs
+        off gradually, up to a maximum of 5 seconds between wake-ups. Resuming
+        the view wakes the loop up straight away.
+        """
+        data_ready, resumed = self.data_ready, self._resumed
+        idle_ticks = 0
+        next_tick = next_redraw = monotonic()
         while not self.view._stopped and self.view.is_open and self.view.root_widget:
-            if self.update():
-                if self._graph:
-                    self.view.flamegraph.draw()
-                else:
-                    self.view.table.draw()
+            if self.model.frozen:
+                idle_ticks += 1
+                try:
+                    await asyncio.wait_for(
+                        resumed.wait(), min(5.0, 1.0 + 0.5 * idle_ticks)
+                    )
+                except asyncio.TimeoutError:
+                    continue
+
+                # The view has just been updated on resume
+                resumed.clear()
+                idle_ticks = 0
+                next_tick = next_redraw = monotonic() + 1
+                continue
+
+            idle_ticks = 0
+            now = monotonic()
+
+            if now >= next_tick:
+                self._update_system()
+                # Pace against the tick rather than the current time so that
+                # the time spent updating the view does not add up across
+                # ticks, unless we have fallen behind.
+                next_tick += 1
+                if next_tick <= now:
+                    next_tick = now + 1
+
+            if now >= next_redraw:
+                data_ready.clear()
+                if self._update_thread_data():
+                    if self._graph:
+                        self.view.flamegraph.draw()
+                    else:
+                        self.view.table.draw()
+                    next_redraw = now + 1
 
             self.view.root_widget.refresh()
 
-            await asyncio.sleep(1)
+            if next_redraw > monotonic():
+                await asyncio.sleep(max(0.0, min(next_tick, next_redraw) - monotonic()))
+                continue
+
+            try:
+                await asyncio.wait_for(
+                    data_ready.wait(), max(0.0, next_tick - monotonic())
+                )
+            except asyncio.TimeoutError:
+                pass
 
     def _change_thread(self, direction: ThreadNav) -> bool:
         """Change thread."""
@@ -198,34 +340,25 @@ class AustinTUIController:
             ),
         )
 
-        if prev_index != austin.current_thread:
-            return self.set_thread()
+        if prev_index == austin.current_thread:
+            return False
 
-        return False
+        self.current_thread()  # type: ignore[call-arg]
+        self.thread_name()
+
+        # Holding down an arrow key would otherwise rebuild the thread data
+        # for every thread we pass through, so we only do it once we stop.
+        self._schedule_data_redraw()
+
+        return True
 
     async def on_next_thread(self) -> bool:
         """Handle next thread event."""
-        if self._change_thread(ThreadNav.NEXT):
-            if self._graph:
-                self.view.flamegraph.draw()
-                self.view.flame_view.refresh()
-            else:
-                self.view.table.draw()
-                self.view.stats_view.refresh()
-            return True
-        return False
+        return self._change_thread(ThreadNav.NEXT)
 
     async def on_previous_thread(self) -> bool:
         """Handle previous thread event."""
-        if self._change_thread(ThreadNav.PREV):
-            if self._graph:
-                self.view.flamegraph.draw()
-                self.view.flame_view.refresh()
-            else:
-                self.view.table.draw()
-                self.view.stats_view.refresh()
-            return True
-        return False
+        return self._change_thread(ThreadNav.PREV)
 
     async def on_full_mode_toggled(self, _: Any = None) -> bool:
         """Toggle full mode."""
@@ -242,22 +375,27 @@ class AustinTUIController:
 
     async def on_save(self, _: Any = None) -> bool:
         """Save the collected stats."""
-        model = self.model.frozen_austin if self.model.frozen else self.model.austin
+        # The live stats are locked while they are dumped, and updating them
+        # needs the same lock. We take a snapshot on the event loop, where the
+        # live stats are updated, and dump that one in the worker instead.
+        model = (
+            self.model.frozen_austin
+            if self.model.frozen
+            else self.model.austin.freeze()
+        )
 
         def _dump_stats() -> None:
             pid = self.model.system.child_process.pid
             filename = f"austin_{int(time())}_{pid}.aprof"
             try:
-                buffer = StringIO()
-                model.stats.dump(buffer)
                 with open(filename, "w") as fout:
                     if self.model.austin.metadata is not None:
                         for n, v in self.model.austin.metadata.items():
                             fout.write(f"# {n}: {v}\n")
                         fout.write("\n")
-                    for line in buffer.getvalue().splitlines():
-                        if not line.startswith("# "):
-                            fout.write(line + "\n")
+                    writer = _SampleWriter(fout)
+                    model.stats.dump(writer)  # type: ignore[arg-type]
+                    writer.close()
                 self.view.notification.set_text(
                     self.view.markup(
                         f"Stats saved as <running>{escape(filename)}</running> "
@@ -279,6 +417,10 @@ class AustinTUIController:
 
         self.model.toggle_freeze()
         self.update()
+        if self.model.frozen:
+            self._resumed.clear()
+        else:
+            self._resumed.set()
         self.view.notification.set_text("Paused" if self.model.frozen else "Resumed")
         return True
 
@@ -291,9 +433,7 @@ class AustinTUIController:
             self.model.austin.threshold = 1.0
 
         if self.view._stopped or self.model.frozen:
-            self.set_thread_data()
-            self.view.table.draw()
-            self.view.table.refresh()
+            self._schedule_data_redraw()
 
         return self.model.austin.threshold
 
@@ -321,3 +461,6 @@ class AustinTUIController:
             self.set_thread_data()
 
         return True
+
+
+AustinTUIController._adapters = _collect_adapters(AustinTUIController)
@@ -20,29 +20,88 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from copy import deepcopy
-from time import time
+from copy import copy
+from dataclasses import replace
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import NamedTuple
 from typing import Optional
 from typing import Tuple
 
 from austin.stats import AustinStats
 from austin.stats import AustinStatsType
+from austin.stats import FrameStats
 from austin.stats import InvalidSample
 from austin.stats import MetricType
+from austin.stats import ProcessStats
 from austin.stats import Sample
 
 from austin_tui import AustinProfileMode
 
 
+class ThreadKey(NamedTuple):
+    """Thread key.
+
+    Identifies a thread by the PID of its process and its thread ID.
+    """
+
+    pid: int
+    thread: str
+
+    def __str__(self) -> str:
+        """The thread key in the ``pid:tid`` format."""
+        return f"{self.pid}:{self.thread}"
+
+
+def _copy_frame_stats(stats: FrameStats) -> FrameStats:
+    # Replacing only the children keeps any other field, like the frame height
+    # of newer versions of austin-python, as is.
+    return replace(
+        stats,
+        children={
+            frame: _copy_frame_stats(child) for frame, child in stats.children.items()
+        },
+    )
+
+
+def _copy_stats(stats: AustinStats) -> AustinStats:
+    # Frames and metrics are immutable, so only the nodes of the call trees,
+    # which are merged in place on update, need copying.
+    snapshot = AustinStats(
+        stats_type=stats.stats_type,
+        processes={
+            pid: ProcessStats(
+                pid=pid,
+                threads={
+                    name: replace(
+                        thread,
+                        children={
+                            frame: _copy_frame_stats(child)
+                            for frame, child in thread.children.items()
+                        },
+                    )
+                    for name, thread in process.threads.items()
+                },
+            )
+            for pid, process in stats.processes.items()
+        },
+    )
+    snapshot.timestamp = stats.timestamp  # type: ignore[attr-defined]
+    return snapshot
+
+
 class OrderedSet:
-    """Ordered set."""
+    """Ordered set.
+
+    Elements are kept in the keys of a dictionary, mapped to their index.
+    The list of the elements, needed for positional access, is only built on
+    demand and dropped whenever a new element is added.
+    """
 
     def __init__(self) -> None:
-        self._items: List[Any] = []
         self._map: Dict[Any, int] = {}
+        self._items: Optional[List[Any]] = None
 
     def __contains__(self, element: Any) -> bool:
         """Check if the set contains the element."""
@@ -50,11 +109,17 @@ class OrderedSet:
 
     def __getitem__(self, i: Any) -> Any:
         """Get the i-th item or the index of the given hashable object."""
-        return self._items[i] if isinstance(i, int) else self._map[i]
+        if not isinstance(i, int):
+            return self._map[i]
+
+        items = self._items
+        if items is None:
+            items = self._items = list(self._map)
+        return items[i]
 
     def __len__(self) -> int:
         """The number of elements in the set."""
-        return len(self._items)
+        return len(self._map)
 
     def add(self, element: Any) -> None:
         """Add an element to the set.
@@ -62,37 +127,44 @@ class OrderedSet:
         If the element is already in the set, nothing happens.
         """
         if element not in self._map:
-            self._map[element] = len(self._items)
-            self._items.append(element)
+            self._map[element] = len(self._map)
+            self._items = None
+
+    def copy(self) -> "OrderedSet":
+        """Make a shallow copy of the set."""
+        other = type(self)()
+        other._map = self._map.copy()
+        # The list of items is never modified in place, so it can be shared.
+        other._items = self._items
+        return other
 
     def __bool__(self) -> bool:
         """Convert to boolean."""
-        return bool(self._items)
+        return bool(self._map)
 
     def __str__(self) -> str:
         """Representation of the set."""
-        return type(self).__name__ + str(self._items)
+        return type(self).__name__ + str(list(self._map))
 
     def __repr__(self) -> str:
         """Representation of the set."""
-        return type(self).__name__ + repr(self._items)
+        return type(self).__name__ + repr(list(self._map))
 
 
 class AustinModel:
     """Austin model."""
 
     def __init__(self) -> None:
-        self.mode = None
+        self._mode: Optional[AustinProfileMode] = None
+        self._metric_type = MetricType.TIME
 
         self._samples = 0
         self._invalids = 0
-        self._last_stack: Dict[str, Sample] = {}
-        self._stats = AustinStats(
-            AustinStatsType.MEMORY
-            if self.mode is AustinProfileMode.MEMORY
-            else AustinStatsType.WALL
-        )
-        self._stats.timestamp = time()
+        self._last_stack: Dict[ThreadKey, Sample] = {}
+        self._stats = AustinStats(AustinStatsType.WALL)
+        # Logical timestamp of the statistics, bumped with every sample that is
+        # merged into them. It is only used to tell whether they have changed.
+        self._stats.timestamp = 0
 
         self._austin_version: Optional[str] = None
         self._python_version: Optional[str] = None
@@ -104,6 +176,19 @@ class AustinModel:
         self.threshold = 0.0
         self.command_line: Optional[str] = None
 
+    @property
+    def mode(self) -> Optional[AustinProfileMode]:
+        """The Austin profile mode."""
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode: Optional[AustinProfileMode]) -> None:
+        """Set the Austin profile mode."""
+        self._mode = mode
+        self._metric_type = (
+            MetricType.MEMORY if mode is AustinProfileMode.MEMORY else MetricType.TIME
+        )
+
     def set_command_line(self, command_line: str) -> None:
         """Set the command line."""
         self.command_line = command_line
@@ -121,28 +206,28 @@ class AustinModel:
         """Set the Austin metadata."""
         self.metadata = metadata
 
-    def update(self, raw_sample: str) -> None:
-        """Update current statistics with a new sample."""
+    def update(self, raw_sample: str) -> bool:
+        """Update current statistics with a new sample.
+
+        Returns whether the sample has been merged into the statistics.
+        """
         try:
-            (sample,) = Sample.parse(
-                raw_sample,
-                MetricType.MEMORY
-                if self.mode is AustinProfileMode.MEMORY
-                else MetricType.TIME,
-            )
+            (sample,) = Sample.parse(raw_sample, self._metric_type)
             if sample.metric.value < 0:
-                return
+                return False
             self._stats.update(sample)
-            self._stats.timestamp = time()
-            thread_key = f"{sample.pid}:{sample.thread}"
+            self._stats.timestamp += 1
+            thread_key = ThreadKey(sample.pid, sample.thread)
             self._last_stack[thread_key] = sample
             self._threads.add(thread_key)
+            return True
         except InvalidSample:
             self._invalids += 1
+            return False
         finally:
             self._samples += 1
 
-    def get_last_stack(self, thread_key: str) -> Sample:
+    def get_last_stack(self, thread_key: ThreadKey) -> Sample:
         """Get the last seen stack for the given thread."""
         return self._last_stack[thread_key]
 
@@ -164,7 +249,7 @@ class AustinModel:
     @property
     def error_rate(self) -> float:
         """Get the error rate."""
-        return self._invalids / self._samples
+        return self._invalids / self._samples if self._samples else 0.0
 
     @property
     def current_thread(self) -> int:
@@ -178,5 +263,14 @@ class AustinModel:
         self._current_thread = n
 
     def freeze(self) -> "AustinModel":
-        """Freeze the model."""
-        return deepcopy(self)
+        """Freeze the model.
+
+        The returned snapshot shares all the immutable data with the live
+        model, like the frames and the last seen samples, and only copies the
+        containers that are updated in place.
+        """
+        frozen = copy(self)
+        frozen._stats = _copy_stats(self._stats)
+        frozen._last_stack = self._last_stack.copy()
+        frozen._threads = self._threads.copy()
+        return frozen
@@ -20,13 +20,16 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import time
+from time import monotonic_ns
+from typing import Optional
+from typing import Tuple
 
 from psutil import NoSuchProcess
 from psutil import Process
 
 
 Seconds = float
+Nanoseconds = int
 Percentage = float
 Bytes = int
 
@@ -45,27 +48,30 @@ class SystemModel:
     """System statistics model."""
 
     def __init__(self) -> None:
-        self._start_time: Seconds = 0
-        self._end_time: Seconds = 0
+        self._start_ns: Nanoseconds = 0
+        self._end_ns: Nanoseconds = 0
 
         self._max_mem: Bytes = 0
 
+        self.cpu: Percentage = 0
+        self.memory: Bytes = 0
+
         self.child_process = None
 
     def start(self) -> None:
         """Start the model."""
-        self._start_time = time.time()
+        self._start_ns = monotonic_ns()
 
     def stop(self) -> None:
         """Stop the model."""
-        self._end_time = time.time()
+        self._end_ns = monotonic_ns()
 
     @property
     def duration(self) -> Seconds:
         """Get the sampling duration."""
         return (
-            (self._end_time or time.time()) - self._start_time
-            if self._start_time
+            ((self._end_ns or monotonic_ns()) - self._start_ns) / 1e9
+            if self._start_ns
             else 0
         )
 
@@ -73,21 +79,24 @@ class SystemModel:
         """Set the child process."""
         self.child_process = child_process
 
-    def get_cpu(self, process: Process) -> Percentage:
-        """Get the process CPU usage."""
-        try:
-            return int(process.cpu_percent())
-        except NoSuchProcess:
-            return 0
+    def sample(self, process: Process) -> Optional[Tuple[Percentage, Bytes]]:
+        """Sample the process CPU and memory usage.
 
-    def get_memory(self, process: Process) -> Bytes:
-        """Get the process memory."""
+        Both metrics are read in one shot and stored in the ``cpu`` and
+        ``memory`` attributes. Return ``None`` if the process no longer exists.
+        """
         try:
-            mem = process.memory_full_info()[0]
-            self._max_mem = max(mem, self._max_mem)
-            return mem
+            with process.oneshot():
+                cpu = int(process.cpu_percent())
+                mem = process.memory_full_info()[0]
         except NoSuchProcess:
-            return 0
+            return None
+
+        self.cpu = cpu
+        self.memory = mem
+        self._max_mem = max(mem, self._max_mem)
+
+        return cpu, mem
 
     @property
     def max_memory(self) -> Bytes:
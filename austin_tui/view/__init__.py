@@ -25,20 +25,21 @@ import curses
 import sys
 from abc import ABC
 from asyncio.coroutines import iscoroutine
-from collections import defaultdict
+from functools import lru_cache
 from typing import Any
 from typing import Callable
 from typing import Coroutine
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Set
 from typing import TextIO
+from typing import Tuple
 from typing import Type
 from typing import Union
 
 from importlib_resources import files
 from lxml.etree import Element
-from lxml.etree import QName
 from lxml.etree import _Comment as Comment
 from lxml.etree import fromstring as parse_xml_string
 from lxml.etree import parse as parse_xml_stream
@@ -59,17 +60,19 @@ class _ClassNotFoundError(Exception):
     pass
 
 
+@lru_cache(maxsize=None)
 def _find_class(class_name: str) -> Type:
-    try:
-        # Try to get a class from the standard catalog
-        return getattr(catalog, class_name)
-    except AttributeError:
-        # Try from any of the loaded modules
-        for _, module in sys.modules.items():
-            try:
-                return getattr(module, class_name)
-            except AttributeError:
-                pass
+    # Try to get a class from the standard catalog first, then from any of the
+    # loaded modules. Only classes that are found are cached, so that a class
+    # from a module that is imported later can still be found.
+    widget_class = getattr(catalog, class_name, None)
+    if widget_class is not None:
+        return widget_class
+
+    for module in list(sys.modules.values()):
+        widget_class = getattr(module, class_name, None)
+        if widget_class is not None:
+            return widget_class
 
     raise _ClassNotFoundError(f"Cannot find class '{class_name}'")
 
@@ -80,17 +83,29 @@ class ViewBuilderError(Exception):
     pass
 
 
-def _issignal(node: Element) -> bool:
-    return QName(node).localname == "signal"
+_NS_PREFIX = "{http://austin.p403n1x87.com/ui}"
 
 
-def _ispalette(node: Element) -> bool:
-    return QName(node).localname == "palette"
+def _localname(node: Element) -> str:
+    # Validate the namespace of the node and return its local name
+    tag = node.tag
+    if not (isinstance(tag, str) and tag.startswith(_NS_PREFIX)):
+        raise ViewBuilderError(f"Node '{node}' has invalid namespace")
+    return tag[len(_NS_PREFIX) :]
 
 
-def _validate_ns(node: Element) -> None:
-    if QName(node).namespace != "http://austin.p403n1x87.com/ui":
-        raise ViewBuilderError(f"Node '{node}' has invalid namespace")
+@lru_cache(maxsize=2048)
+def _markup(text: str, palette: Palette) -> AttrString:
+    # Attribute strings are not modified once built, so they can be shared
+    return markup(text, palette)
+
+
+def _coroutine_methods(cls: type) -> Tuple[str, ...]:
+    methods = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in klass.__dict__.items():
+            methods[name] = asyncio.iscoroutinefunction(value)
+    return tuple(sorted(name for name, is_coroutine in methods.items() if is_coroutine))
 
 
 class View(ABC):
@@ -100,30 +115,44 @@ class View(ABC):
     opened.
     """
 
+    _coroutine_methods: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Collect the names of the coroutine methods of the view class."""
+        super().__init_subclass__(**kwargs)
+        cls._coroutine_methods = _coroutine_methods(cls)
+
     def __init__(self, name: str) -> None:
-        self._tasks: List[asyncio.Task] = []
+        self._tasks: Set[asyncio.Future] = set()
+        self._failed_tasks: List[asyncio.Future] = []
 
-        self._event_handlers: Dict[str, List[EventHandler]] = defaultdict(list)
+        self._event_handlers: Dict[str, Tuple[EventHandler, ...]] = {}
+        self._handlers: Set[EventHandler] = set()
 
         self._open = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
         self.name = name
         self.palette = Palette()
         self.root_widget = None
 
-    def _create_tasks(self) -> None:
-        loop = asyncio.get_event_loop()
-        event_handlers = set(_ for hs in self._event_handlers.values() for _ in hs)
-        self._tasks = [
-            loop.create_task(coro())
-            for coro in (
-                attr
-                for attr in (getattr(self, name) for name in dir(self))
-                if callable(attr)
-                and asyncio.iscoroutinefunction(attr)
-                and attr not in event_handlers
-            )
-        ]
+    def _create_tasks(self, loop: asyncio.AbstractEventLoop) -> None:
+        handlers = self._handlers
+        for coro in (getattr(self, name) for name in self._coroutine_methods):
+            if coro not in handlers:
+                self._add_task(loop.create_task(coro()))
+
+    def _add_task(self, task: asyncio.Future) -> None:
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: asyncio.Future) -> None:
+        # Failed tasks are kept until the input loop retrieves their result,
+        # so that the exception reaches the exception handler.
+        if task.cancelled() or task.exception() is None:
+            self._tasks.discard(task)
+        else:
+            self._failed_tasks.append(task)
 
     def on_exception(self, exc: Exception) -> None:
         """Default task exception callback.
@@ -138,46 +167,79 @@ class View(ABC):
             if not self.root_widget:
                 raise RuntimeError("Missing root widget")
 
-            while self._open:
-                await asyncio.sleep(0.015)
-
-                if not self.root_widget._win:
-                    continue
+            # Wake up as soon as there is user input on stdin, where the event
+            # loop supports it. The loop still wakes up periodically to pick
+            # up terminal resize events and to collect finished tasks. Fall
+            # back to polling more frequently otherwise.
+            loop = self._loop or asyncio.get_event_loop()
+            input_ready = asyncio.Event()
+            try:
+                stdin = sys.stdin.fileno()
+                loop.add_reader(stdin, input_ready.set)
+            except (NotImplementedError, OSError, ValueError):
+                stdin = None
 
-                # Handle user input on the root widget
-                try:
-                    event = self.root_widget._win.getkey()
-                    if event in self._event_handlers:
-                        done, pending = await asyncio.wait(
-                            [
-                                asyncio.create_task(_())
-                                for _ in self._event_handlers[event]
-                            ]
-                        )
-                        assert not pending
-                        if any(_.result() for _ in done):
-                            self.root_widget.refresh()
-                except (KeyError, curses.error):
-                    pass
-
-                # Retrieve the result of finished tasks
-                finished_tasks = []
-                running_tasks = []
-                for task in self._tasks:
-                    if task.done():
-                        finished_tasks.append(task)
+            try:
+                while self._open:
+                    if stdin is None:
+                        await asyncio.sleep(0.015)
                     else:
-                        running_tasks.append(task)
-                self._tasks = running_tasks
+                        try:
+                            await asyncio.wait_for(input_ready.wait(), 0.1)
+                        except asyncio.TimeoutError:
+                            pass
+                        input_ready.clear()
 
-                for task in finished_tasks:
-                    task.result()
+                    if not self.root_widget._win:
+                        continue
+
+                    # Handle all the pending user input on the root widget. The
+                    # screen is refreshed at most once, after all the events
+                    # have been handled.
+                    dirty = False
+                    while True:
+                        try:
+                            event = self.root_widget._win.getkey()
+                        except curses.error:
+                            break
+
+                        try:
+                            handlers = self._event_handlers.get(event)
+                            if handlers is None:
+                                continue
+
+                            # Most events have a single handler, which can be
+                            # awaited directly without wrapping it in a task.
+                            if len(handlers) == 1:
+                                if await handlers[0]():
+                                    dirty = True
+                                continue
+
+                            done, pending = await asyncio.wait(
+                                [loop.create_task(_()) for _ in handlers]
+                            )
+                            assert not pending
+                            if any(_.result() for _ in done):
+                                dirty = True
+                        except (KeyError, curses.error):
+                            pass
+
+                    if dirty:
+                        self.root_widget.refresh()
+
+                    # Retrieve the result of failed tasks
+                    while self._failed_tasks:
+                        task = self._failed_tasks.pop(0)
+                        self._tasks.discard(task)
+                        task.result()
+            finally:
+                if stdin is not None:
+                    loop.remove_reader(stdin)
         except Exception as exc:
             self.on_exception(exc)
 
     def _build(self, node: Element) -> Widget:
-        _validate_ns(node)
-        widget_class = QName(node).localname
+        widget_class = _localname(node)
         try:
             # Try to get a widget from the standard catalog
             widget = _find_class(widget_class)(**node.attrib)
@@ -193,11 +255,16 @@ class View(ABC):
         """Connect event handlers."""
         if handler is None:
             raise ValueError(f"{handler} is not a valid handler")
-        self._event_handlers[event].append(handler)
+        self._event_handlers[event] = self._event_handlers.get(event, ()) + (handler,)
+        self._handlers.add(handler)
 
     def markup(self, text: Any) -> AttrString:
-        """Convert a markup string into an attribute string."""
-        return markup(str(text), self.palette)
+        """Convert a markup string into an attribute string.
+
+        The same attribute string is returned for the same markup, so it must
+        not be modified.
+        """
+        return _markup(str(text), self.palette)
 
     def open(self) -> None:
         """Open the view.
@@ -212,12 +279,15 @@ class View(ABC):
         self._open = True
 
         self.palette.init()
+        # Drop any markup resolved against colors redefined before opening
+        _markup.cache_clear()
 
         self.root_widget.resize(Rect(0, self.root_widget.get_size()))
         self.root_widget.draw()
         self.root_widget.refresh()
 
-        self._create_tasks()
+        self._loop = loop = asyncio.get_event_loop()
+        self._create_tasks(loop)
 
     def submit_task(
         self,
@@ -233,19 +303,20 @@ class View(ABC):
         callable object. Any exception thrown within the task can be retrieved
         from the ``on_exception`` callback.
         """
+        loop = self._loop or asyncio.get_event_loop()
         if isinstance(task, asyncio.Task):
-            self._tasks.append(task)
+            self._add_task(task)
         elif iscoroutine(task):
-            self._tasks.append(asyncio.create_task(task))  # type: ignore[arg-type]
+            self._add_task(loop.create_task(task))  # type: ignore[arg-type]
         else:
-            self._tasks.append(asyncio.get_event_loop().run_in_executor(None, task))  # type: ignore[arg-type]
+            self._add_task(loop.run_in_executor(None, task))  # type: ignore[arg-type]
 
     def close(self) -> None:
         """Close the view."""
         if self._open and self.root_widget:
             self.root_widget.hide()
 
-        for task in self._tasks:
+        for task in list(self._tasks):
             task.cancel()
             if task.done():
                 task.result()
@@ -258,18 +329,30 @@ class View(ABC):
         return self._open
 
 
+@lru_cache(maxsize=None)
+def _load_resource(module: str, resource: str) -> Element:
+    # The builder only ever reads the parsed tree, so it is safe to share it
+    # between the views built from the same resource.
+    return parse_xml_string(
+        files(module).joinpath(resource).read_text(encoding="utf8").encode()
+    )
+
+
+View._coroutine_methods = _coroutine_methods(View)
+
+
 class ViewBuilder:
     """View builder class."""
 
     def __init__(self, view_node: Element) -> None:
-        _validate_ns(view_node)
+        _localname(view_node)
         self._root = view_node
         self._signals: Dict[str, str] = {}
         self._autoconnect = False
         self._view: Optional[View] = None
 
     def _parse(self) -> View:
-        view_class = QName(self._root).localname
+        view_class = _localname(self._root)
         try:
             view = _find_class(view_class)(**self._root.attrib)
         except _ClassNotFoundError:
@@ -293,12 +376,12 @@ class ViewBuilder:
         for node in rest:
             if isinstance(node, Comment):
                 continue
-            _validate_ns(node)
-            if _issignal(node):
+            localname = _localname(node)
+            if localname == "signal":
                 event = node.attrib["key"]
                 handler = node.attrib["handler"]
                 self._signals[event] = handler
-            elif _ispalette(node):
+            elif localname == "palette":
                 for color in node:
                     if isinstance(color, Comment):
                         continue
@@ -349,8 +432,4 @@ class ViewBuilder:
     @classmethod
     def from_resource(cls, module: str, resource: str) -> "ViewBuilder":
         """Build view from a resource file."""
-        return cls(
-            parse_xml_string(
-                files(module).joinpath(resource).read_text(encoding="utf8").encode()
-            )
-        )
+        return cls(_load_resource(module, resource))
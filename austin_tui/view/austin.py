@@ -22,9 +22,12 @@
 
 import asyncio
 from enum import Enum
+from functools import lru_cache
+from math import ceil
 from typing import Any
 from typing import Callable
 from typing import Optional
+from typing import Tuple
 
 from austin_tui import AustinProfileMode
 from austin_tui.adapters import fmt_time as _fmt_time
@@ -33,6 +36,16 @@ from austin_tui.widgets.markup import AttrString
 from austin_tui.widgets.markup import AttrStringChunk
 
 
+# The table cells are drawn from a small set of distinct values, so we share
+# the attribute string chunks among them rather than creating new ones on
+# every update. These must therefore be treated as immutable.
+
+
+@lru_cache(maxsize=2048)
+def _chunk(text: str, color: int) -> AttrStringChunk:
+    return AttrStringChunk(text, color=color)
+
+
 # ---- AustinView -------------------------------------------------------------
 
 
@@ -57,6 +70,8 @@ class AustinView(View):
         self.callback = callback
 
         self._stopped = False
+        self._heat_levels: Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]] = None
+        self._cell_colors: Optional[Tuple[int, int]] = None
 
     def on_exception(self, exc: Exception) -> None:
         """The on exception Austin view handler."""
@@ -184,12 +199,18 @@ class AustinView(View):
         self.table.draw()
         self.root_widget.refresh()
 
-    def fmt_time(self, t: int, active: bool = True) -> AttrString:
+    def _cell_color(self, active: bool) -> int:
+        colors = self._cell_colors
+        if colors is None:
+            get_color = self.palette.get_color
+            colors = self._cell_colors = (get_color("inactive"), get_color("default"))
+        return colors[active]
+
+    def fmt_time(self, t: int, active: bool = True) -> AttrStringChunk:
         """Format time value."""
-        time = f"{_fmt_time(t):^8}"
-        return self.markup(f"<inactive>{time}</inactive>" if not active else time)
+        return _chunk(f"{_fmt_time(t):^8}", self._cell_color(active))
 
-    def fmt_mem(self, s: int, active: bool = True) -> AttrString:
+    def fmt_mem(self, s: int, active: bool = True) -> AttrStringChunk:
         """Format memory value."""
         units = ["B", "K", "M"]
 
@@ -198,21 +219,24 @@ class AustinView(View):
         while ss >= 1024 and i < len(units) - 1:
             i += 1
             ss >>= 10
-        mem = f"{ss: 6d}{units[i]} "
-        return self.markup(f"<inactive>{mem}</inactive>" if not active else mem)
+        return _chunk(f"{ss: 6d}{units[i]} ", self._cell_color(active))
 
     def color_level(self, value: float, active: bool = True) -> int:
         """Return the value heat."""
-        prefix = ("i" if not active else "") + "heat"
-        for stop in [20, 40, 60, 80, 100]:
-            if value <= stop:
-                return self.palette.get_color(prefix + str(stop))
-        return self.palette.get_color(prefix + "100")
+        levels = self._heat_levels
+        if levels is None:
+            # Map the integer ceiling of every value to the color of its heat
+            # band, for inactive and active values respectively.
+            get_color = self.palette.get_color
+            bands = [min(100, 20 * max(1, ceil(v / 20))) for v in range(102)]
+            levels = self._heat_levels = (
+                tuple(get_color(f"iheat{band}") for band in bands),
+                tuple(get_color(f"heat{band}") for band in bands),
+            )
+        return levels[active][max(0, min(ceil(value), 101))]
 
     def _scaler(self, ratio: float, active: bool) -> AttrStringChunk:
-        return AttrStringChunk(
-            f"{min(100, ratio):6.1f}% ", color=self.color_level(ratio, active)
-        )
+        return _chunk(f"{min(100, ratio):6.1f}% ", self.color_level(ratio, active))
 
     def scale_memory(
         self, memory: int, max_memory: int, active: bool = True
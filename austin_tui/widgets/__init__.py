@@ -136,14 +136,27 @@ class Widget:
         """Widget textual representation."""
         return f"{self.__class__.__name__}({self.name})"
 
-    def refresh(self) -> None:
-        """Refresh the widget.
+    def noutrefresh(self) -> None:
+        """Mark the widget for refresh.
 
         This method should cause the appropriate underlying curses window to be
-        refreshed in order to actually draw the changed widgets.
+        marked for refresh, without actually updating the physical screen.
         """
         if self._win:
-            self._win.refresh()
+            self._win.noutrefresh()
+
+    def refresh(self) -> None:
+        """Refresh the widget.
+
+        All the changed curses windows are marked for refresh first and then
+        the physical screen is updated in one go.
+        """
+        self.noutrefresh()
+        try:
+            curses.doupdate()
+        except curses.error:
+            # curses has not been initialised
+            pass
 
     def show(self) -> None:
         """Show the widget.
@@ -249,9 +262,9 @@ class Container(BaseContainer):
             refresh |= child.draw()
         return refresh
 
-    def refresh(self) -> None:
-        """Refresh child widgets."""
-        super().refresh()
+    def noutrefresh(self) -> None:
+        """Mark child widgets for refresh."""
+        super().noutrefresh()
 
         for child in self._children:
-            child.refresh()
+            child.noutrefresh()
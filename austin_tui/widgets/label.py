@@ -23,6 +23,7 @@
 import curses
 from collections import deque
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 from typing import Optional
 
@@ -40,6 +41,7 @@ class TextAlign(Enum):
     CENTER = "^"
 
 
+@lru_cache(maxsize=512)
 def ell(text: str, length: int, sep: str = "..") -> str:
     """Ellipsize a string to a given length using the given separator."""
     if len(text) <= length:
@@ -53,7 +55,7 @@ def ell(text: str, length: int, sep: str = "..") -> str:
     a = len(sep) >> 1
     b = len(sep) - a
 
-    return text[: n - b - 1] + sep + text[-m + a - 1 :]
+    return f"{text[: n - b - 1]}{sep}{text[-m + a - 1 :]}"
 
 
 class Label(Widget):
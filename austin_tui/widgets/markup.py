@@ -27,6 +27,7 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import List
+from typing import Optional
 from xml.sax.saxutils import escape
 
 from lxml import etree
@@ -115,8 +116,8 @@ class AttrString(Writable):
     attributes (e.g. color).
     """
 
-    def __init__(self) -> None:
-        self._chunks: List[AttrStringChunk] = []
+    def __init__(self, chunks: Optional[List[AttrStringChunk]] = None) -> None:
+        self._chunks: List[AttrStringChunk] = chunks if chunks is not None else []
 
     def append(self, chunk: AttrStringChunk) -> None:
         """Append a chunk."""
@@ -212,8 +212,8 @@ class ScrollView(Container):
 
         return True
 
-    def refresh(self) -> None:
-        """Refresh the scroll view."""
+    def noutrefresh(self) -> None:
+        """Mark the visible part of the scroll view for refresh."""
         if not self._win:
             return
 
@@ -226,6 +226,6 @@ class ScrollView(Container):
 
         y2, x2 = y1 + h - 1, x1 + w - 1
 
-        self._win.refresh(self.curr_y, self.curr_x, y1, x1, y2, x2)
+        self._win.noutrefresh(self.curr_y, self.curr_x, y1, x1, y2, x2)
         for child in self._children:
-            child.refresh()
+            child.noutrefresh()
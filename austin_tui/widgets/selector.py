@@ -97,11 +97,11 @@ class Selector(BaseContainer):
         except SelectorError:
             return False
 
-    def refresh(self) -> None:
-        """Refresh the selected widget."""
-        super().refresh()
+    def noutrefresh(self) -> None:
+        """Mark the selected widget for refresh."""
+        super().noutrefresh()
 
         try:
-            self.selected.refresh()
+            self.selected.noutrefresh()
         except SelectorError:
             pass
@@ -22,13 +22,14 @@
 
 from typing import Any
 from typing import List
+from typing import Sequence
 
 from austin_tui.widgets import Rect
 from austin_tui.widgets import Widget
 from austin_tui.widgets.markup import Writable
 
 
-TableData = List[List[Any]]
+TableData = List[Sequence[Any]]
 
 
 class Table(Widget):
@@ -52,7 +53,7 @@ class Table(Widget):
 
         return True
 
-    def _draw_row(self, i: int, row: List[Any]) -> None:
+    def _draw_row(self, i: int, row: Sequence[Any]) -> None:
         x = 0
         available = self.rect.size.x
         win = self.win.get_win()
@@ -68,6 +69,11 @@ class Table(Widget):
                 delta = min(available - x, len(text))
             x += delta
 
+    @property
+    def data(self) -> TableData:
+        """The current table data."""
+        return self._data
+
     def set_data(self, data: TableData) -> bool:
         """Set the table data.
 
@@ -12,6 +12,9 @@ class MWindow:
     def refresh(self):
         pass
 
+    def noutrefresh(self):
+        pass
+
     def resize(self, *args, **kwargs):
         pass
 
@@ -0,0 +1,89 @@
+from time import sleep
+
+import pytest
+
+import austin_tui.view.austin  # noqa
+from austin_tui.adapters import ThreadDataAdapter
+from austin_tui.adapters import ThreadFullDataAdapter
+from austin_tui.adapters import fmt_time
+from austin_tui.model import Model
+from austin_tui.view import ViewBuilder
+
+
+@pytest.mark.parametrize(
+    "us, expected",
+    [
+        (0, '00"'),
+        (499_999, '00"'),
+        (500_000, '01"'),
+        (59_000_000, '59"'),
+        (59_500_000, "1'00\""),
+        (61_000_000, "1'01\""),
+        (3_600_000_000, "60'00\""),
+    ],
+)
+def test_fmt_time(us, expected):
+    assert fmt_time(us) == expected
+
+
+def test_thread_full_data_elision():
+    model = Model()
+    for i in range(2500):
+        model.austin.update(f"P42;T0x1;foo.py:main:1;foo.py:f{i}:{i + 2} 100")
+    model.system.start()
+
+    view = ViewBuilder.from_resource("austin_tui.view", "tui.austinui").build()
+    rows = ThreadFullDataAdapter(model, view).transform()
+
+    # The main frame and its first 1999 children fit in the table
+    assert len(rows) == ThreadFullDataAdapter.max_rows + 1
+    assert str(rows[-1][-1]) == " … 501 more frames elided"
+
+
+def test_thread_full_data_elision_nested():
+    model = Model()
+    stack = ";".join(f"foo.py:f{i}:{i + 1}" for i in range(2500))
+    model.austin.update(f"P42;T0x1;{stack} 100")
+    model.austin.update("P42;T0x1;foo.py:f0:1;bar.py:g:1 100")
+    model.system.start()
+
+    view = ViewBuilder.from_resource("austin_tui.view", "tui.austinui").build()
+    rows = ThreadFullDataAdapter(model, view).transform()
+
+    # The deep stack fills the table and the whole of its tail is elided,
+    # together with the pending sibling branch.
+    assert len(rows) == ThreadFullDataAdapter.max_rows + 1
+    assert str(rows[-1][-1]) == " … 501 more frames elided"
+
+
+def test_thread_full_data_elision_single_frame():
+    model = Model()
+    stack = ";".join(f"foo.py:f{i}:{i + 1}" for i in range(2001))
+    model.austin.update(f"P42;T0x1;{stack} 100")
+    model.system.start()
+
+    view = ViewBuilder.from_resource("austin_tui.view", "tui.austinui").build()
+    rows = ThreadFullDataAdapter(model, view).transform()
+
+    assert str(rows[-1][-1]) == " … 1 more frame elided"
+
+
+def test_thread_data_skips_unchanged_empty_data():
+    model = Model()
+    model.austin.update("P42;T0x1;foo.py:main:1 100")
+    model.austin.threshold = 1.0
+    model.system.start()
+    sleep(0.01)  # Make sure the sample is below the threshold
+    model.system.stop()
+
+    view = ViewBuilder.from_resource("austin_tui.view", "tui.austinui").build()
+    adapter = ThreadDataAdapter(model, view)
+    calls = []
+    transform = adapter._transform
+    adapter._transform = lambda *args: calls.append(args) or transform(*args)
+
+    for _ in range(3):
+        adapter()
+
+    assert len(calls) == 1
+    assert view.table.data == []
@@ -0,0 +1,66 @@
+from io import StringIO
+
+from austin.stats import MetricType
+
+from austin_tui import AustinProfileMode
+from austin_tui.model.austin import AustinModel
+from austin_tui.model.austin import OrderedSet
+from austin_tui.model.austin import ThreadKey
+
+
+def test_austin_model_freeze():
+    model = AustinModel()
+    model.update("P42;T0x1;foo.py:main:1;foo.py:bar:5 100")
+
+    frozen = model.freeze()
+
+    model.update("P42;T0x1;foo.py:main:1;foo.py:baz:8 200")
+    model.update("P42;T0x2;foo.py:main:1 300")
+
+    assert frozen.samples_count == 1
+    assert len(frozen.threads) == 1
+    assert frozen.get_last_stack(ThreadKey(42, "0x1")).frames[-1].function == "bar"
+
+    (main,) = frozen.stats.get_process(42).threads["0x1"].children.values()
+    assert main.total.value == 100
+    assert [frame.function for frame in main.children] == ["bar"]
+
+    buffer = StringIO()
+    frozen.stats.dump(buffer)
+    assert buffer.getvalue().splitlines()[2:] == [
+        "P42;T0x1;foo.py:main:1;foo.py:bar:5 100"
+    ]
+
+
+def test_ordered_set():
+    items = OrderedSet()
+    for element in "abcab":
+        items.add(element)
+
+    assert len(items) == 3
+    assert items[1] == "b"
+    assert items["c"] == 2
+
+    items.add("d")
+    assert items[-1] == "d"
+    assert "d" in items
+    assert str(items) == "OrderedSet['a', 'b', 'c', 'd']"
+
+
+def test_austin_model_memory_mode():
+    model = AustinModel()
+    model.mode = AustinProfileMode.MEMORY
+    assert not model.update("P42;T0x1;foo.py:main:1 -1024")
+    assert model.update("P42;T0x1;foo.py:main:1 2048")
+
+    assert model.samples_count == 2
+    assert model.get_last_stack(ThreadKey(42, "0x1")).metric.type is MetricType.MEMORY
+
+
+def test_austin_model_error_rate():
+    model = AustinModel()
+    assert model.error_rate == 0.0
+
+    assert model.update("P42;T0x1;foo.py:main:1 100")
+    assert not model.update("invalid")
+    assert model.error_rate == 0.5
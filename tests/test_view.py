@@ -25,3 +25,16 @@ def test_austin_view():
 
     assert view.dataview_selector.rect == Rect(4j, 80 + 27j)
     assert view.flame_view.rect == Rect(5j, 80 + 26j)
+
+
+def test_austin_view_color_level():
+    view = ViewBuilder.from_resource("austin_tui.view", "tui.austinui").build()
+    palette = view.palette
+
+    assert view.color_level(0) == palette.get_color("heat20")
+    assert view.color_level(-5) == palette.get_color("heat20")
+    assert view.color_level(20) == palette.get_color("heat20")
+    assert view.color_level(20.01) == palette.get_color("heat40")
+    assert view.color_level(99.5) == palette.get_color("heat100")
+    assert view.color_level(250) == palette.get_color("heat100")
+    assert view.color_level(55, active=False) == palette.get_color("iheat60")